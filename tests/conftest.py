@@ -0,0 +1,30 @@
+import datetime
+import os
+import sys
+
+import pytest
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Cuspal_Interlink_rev_25 as ci  # noqa: E402
+
+NATAL_UTC = datetime.datetime(1985, 3, 4, 6, 30, tzinfo=pytz.utc)
+
+
+@pytest.fixture(scope='session')
+def interlink_engine():
+    """
+    A headless engine with a Delhi natal chart and the classifications of the first event with a
+    Primary Cusp, and the (strict_rps, relaxed_rps, pc, scs) arguments of its interlink scans.
+    Every lord is let through as an RP so the scans find plenty of runs.
+    """
+    event = next(event for event in ci.EVENT_DATASET if event.get("Primary Cusp") in range(1, 13))
+    engine = ci.AnalysisEngine('Delhi', 'Placidus', timezone_name='Asia/Kolkata',
+                               event_type=ci.event_type_label(event), primary_cusp=event['Primary Cusp'],
+                               secondary_cusp_selection=ci.event_secondary_cusp_selection(event))
+    engine.generate_chart(NATAL_UTC)
+    pc_for_analysis = engine._determine_primary_cusp_for_analysis(event['Primary Cusp'])
+    engine._cache_static_planet_classifications(pc_for_analysis, event['Primary Cusp'])
+    all_lords = set(ci.LORD_ORDER)
+    return engine, (all_lords, all_lords, pc_for_analysis, engine._get_selected_secondary_cusps())
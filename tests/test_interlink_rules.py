@@ -0,0 +1,129 @@
+import datetime
+import itertools
+import random
+
+import pytest
+import pytz
+
+import Cuspal_Interlink_rev_25 as ci
+
+# Recorded charts: (city, first instant); each is sampled every 97 minutes for two days.
+RECORDED_CHARTS = [('Delhi', datetime.datetime(1985, 3, 4, 6, 30, tzinfo=pytz.utc)),
+                   ('Mumbai', datetime.datetime(1992, 11, 21, 18, 5, tzinfo=pytz.utc)),
+                   ('Kolkata', datetime.datetime(2003, 7, 9, 1, 44, tzinfo=pytz.utc)),
+                   ('Chennai', datetime.datetime(2025, 6, 1, 0, 17, 23, tzinfo=pytz.utc))]
+CLASSES = ['Positive', 'Positive', 'Neutral', 'Neutral', 'Negative', None]
+
+
+def recorded_charts():
+    engine = ci.AnalysisEngine()
+    hsys_const = ci.HOUSE_SYSTEMS['Placidus']
+    for city, first in RECORDED_CHARTS:
+        for step in range(30):
+            planets, cusps, _ = engine._calculate_chart_data(first + datetime.timedelta(minutes=97 * step),
+                                                             city, hsys_const)
+            yield planets, cusps
+
+
+def random_rule_inputs(rng):
+    classifications = {}
+    for planet in ci.LORD_ORDER:
+        cls = rng.choice(CLASSES)
+        if cls is not None:
+            classifications[planet] = cls
+    strict_rps = set(rng.sample(ci.LORD_ORDER, rng.randint(0, 9)))
+    relaxed_rps = strict_rps | set(rng.sample(ci.LORD_ORDER, rng.randint(0, 9)))
+    ruling_planets = set(rng.sample(ci.LORD_ORDER, rng.randint(1, 9))) if rng.random() < 0.8 else None
+    pc = rng.choice(list(range(1, 13)) + [0])
+    scs = rng.sample([n for n in range(1, 13) if n != pc] + [13], rng.randint(0, 3))
+    return classifications, strict_rps, relaxed_rps, ruling_planets, pc, scs
+
+
+def is_favourable(classifications, planet):
+    return classifications.get(planet, 'Negative') in ['Positive', 'Neutral']
+
+
+def dict_links(planets, cusps, classifications, strict_rps, relaxed_rps, pc, scs):
+    """The scan rule as checked on the name-keyed chart dicts before it was compiled to masks."""
+    if pc not in cusps:
+        return None, []
+    pc_sub_lord = cusps[pc][4]
+    if pc_sub_lord not in strict_rps:
+        return pc_sub_lord, []
+    star_lord = planets[pc_sub_lord][3]
+    if star_lord not in relaxed_rps:
+        return pc_sub_lord, []
+
+    star_lord_favourable = is_favourable(classifications, star_lord)
+    rahu_dispositors = {planets['Rahu'][2], planets['Rahu'][3]}
+    ketu_dispositors = {planets['Ketu'][2], planets['Ketu'][3]}
+    labels = []
+    for sc_num in scs:
+        if sc_num not in cusps:
+            continue
+        sc_sub_lord = cusps[sc_num][4]
+        if not is_favourable(classifications, sc_sub_lord):
+            continue
+        if sc_sub_lord == star_lord:
+            labels.append(f"Std. Link to H{sc_num}")
+        elif sc_sub_lord == 'Rahu' and star_lord_favourable and star_lord in rahu_dispositors:
+            labels.append(f"Rahu Agency to H{sc_num}")
+        elif sc_sub_lord == 'Ketu' and star_lord_favourable and star_lord in ketu_dispositors:
+            labels.append(f"Ketu Agency to H{sc_num}")
+        elif star_lord_favourable and planets[sc_sub_lord][3] == star_lord:
+            labels.append(f"Shared SL to H{sc_num}")
+    return pc_sub_lord, labels
+
+
+def dict_star_sub_match(planets, cusps, classifications, ruling_planets, pc, scs):
+    """The static promise / _is_interlink_active rule on the chart dicts, with its SC connections."""
+
+    def qualifies(planet):
+        return is_favourable(classifications, planet) and (ruling_planets is None or planet in ruling_planets)
+
+    if pc not in cusps or not qualifies(cusps[pc][4]):
+        return None
+    pc_sub_lord = cusps[pc][4]
+    star_lord, sub_lord = planets[pc_sub_lord][3], planets[pc_sub_lord][4]
+    if not qualifies(star_lord) or not qualifies(sub_lord):
+        return None
+    connections = {}
+    for sc_num in scs:
+        if sc_num not in cusps:
+            return None
+        connection_type = []
+        if star_lord == cusps[sc_num][4]:
+            connection_type.append("Star Match")
+        if sub_lord == cusps[sc_num][4]:
+            connection_type.append("Sub Match")
+        if not connection_type:
+            return None
+        connections[sc_num] = " / ".join(connection_type)
+    return (pc_sub_lord, star_lord, sub_lord), connections
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_compiled_rules_match_dict_rules(seed):
+    rng = random.Random(seed)
+    links = matches = 0
+    for (planets, cusps), _ in itertools.product(recorded_charts(), range(10)):
+        classifications, strict_rps, relaxed_rps, ruling_planets, pc, scs = random_rule_inputs(rng)
+        chart = ci.CompactChart.from_positions(planets, cusps)
+
+        rules = ci.InterlinkRules(classifications, pc, scs, strict_rps, relaxed_rps)
+        pc_sub_lord, labels, _ = rules.links(chart)
+        expected_sub_lord, expected_labels = dict_links(planets, cusps, classifications, strict_rps,
+                                                        relaxed_rps, pc, scs)
+        assert (labels, ci._lord_name(pc_sub_lord)) == (expected_labels, expected_sub_lord)
+        links += bool(labels)
+
+        rules = ci.InterlinkRules(classifications, pc, scs, ruling_planets=ruling_planets)
+        match = rules.star_sub_match(chart)
+        expected = dict_star_sub_match(planets, cusps, classifications, ruling_planets, pc, scs)
+        if expected is None:
+            assert match is None
+            continue
+        matches += 1
+        assert tuple(ci.LORD_ORDER[code] for code in match) == expected[0]
+        assert rules.star_sub_connections(chart, *match[1:]) == expected[1]
+    assert links and matches
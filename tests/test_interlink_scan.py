@@ -0,0 +1,79 @@
+import datetime
+
+import pytest
+import pytz
+
+import Cuspal_Interlink_rev_25 as ci
+
+SCAN_START = datetime.datetime(2025, 6, 1, 0, 17, 23, tzinfo=pytz.utc)
+
+
+def scan_windows():
+    """Two windows, each several parallel scan chunks long."""
+    return [{'start_utc': SCAN_START, 'end_utc': SCAN_START + datetime.timedelta(hours=10),
+             'original_display_row': ()},
+            {'start_utc': SCAN_START + datetime.timedelta(hours=15),
+             'end_utc': SCAN_START + datetime.timedelta(hours=26), 'original_display_row': ()}]
+
+
+def test_jd_to_utc_round_up_keeps_whole_seconds():
+    for step in range(2400):
+        instant = SCAN_START + datetime.timedelta(hours=2 * step)
+        assert ci.jd_to_utc(ci.utc_to_jd(instant), round_up=True) == instant
+
+
+def test_jd_to_utc_round_up_goes_to_next_second():
+    jd = ci.utc_to_jd(SCAN_START) + 0.25 / 86400
+    assert ci.jd_to_utc(jd, round_up=True) == SCAN_START + datetime.timedelta(seconds=1)
+    assert ci.jd_to_utc(jd) == SCAN_START
+
+
+@pytest.mark.parametrize('interval_hits', [False, True])
+def test_parallel_scan_matches_serial_across_chunk_edges(interlink_engine, interval_hits):
+    engine, (strict_rps, relaxed_rps, pc, scs) = interlink_engine
+    windows = scan_windows()
+    assert len(ci.split_scan_window(windows[0]['start_utc'], windows[0]['end_utc'])) > 1
+
+    serial = engine._run_serial_interlink_scan(windows, interval_hits, strict_rps, relaxed_rps, pc, scs, None, "")
+    parallel = engine._perform_cuspal_interlink_scan_parallel(windows, strict_rps, relaxed_rps, pc, scs, None,
+                                                              interval_hits=interval_hits, max_workers=2)
+    assert serial
+    assert parallel == serial
+
+
+def test_checkpointed_scan_matches_plain_scan(interlink_engine, tmp_path):
+    engine, scan_args = interlink_engine
+    windows = scan_windows()
+    plain = list(engine._iter_interlink_window_runs(windows, *scan_args))
+
+    checkpoint = ci.ScanCheckpoint('interlink_test', 'params', directory=str(tmp_path))
+    assert list(engine._iter_checkpointed_window_runs(windows, *scan_args, checkpoint)) == plain
+
+
+def test_resumed_checkpointed_scan_matches_plain_scan(interlink_engine, tmp_path):
+    engine, scan_args = interlink_engine
+    windows = scan_windows()
+    plain = list(engine._iter_interlink_window_runs(windows, *scan_args))
+
+    # A scan stopped after the first chunk of the second window, saved and loaded again
+    checkpoint = ci.ScanCheckpoint('interlink_test', 'params', directory=str(tmp_path))
+    checkpoint.record('0', windows[0]['end_utc'], plain[0][1], finished=True)
+    chunk_start, chunk_end = ci.split_scan_window(windows[1]['start_utc'], windows[1]['end_utc'])[0]
+    chunk_runs, _ = engine._scan_interlink_chunk(chunk_start, chunk_end, *scan_args)
+    checkpoint.record('1', chunk_end, chunk_runs)
+    resumed = ci.ScanCheckpoint.load(checkpoint.save())
+
+    assert list(engine._iter_checkpointed_window_runs(windows, *scan_args, resumed)) == plain
+
+
+def test_scan_includes_window_end(interlink_engine):
+    engine, scan_args = interlink_engine
+    runs, _ = engine._scan_interlink_chunk(SCAN_START, SCAN_START + datetime.timedelta(hours=6), *scan_args)
+    run_start, _, signature = runs[1]
+
+    # A window ending exactly where an interlink starts still reports it, as the instant it ends on
+    end_runs, _ = engine._scan_interlink_chunk(SCAN_START, run_start, *scan_args)
+    assert end_runs[-1] == (run_start, run_start, signature)
+    hits = engine._perform_cuspal_interlink_scan(
+        [{'start_utc': SCAN_START, 'end_utc': run_start, 'original_display_row': ()}], *scan_args, None)
+    assert hits[-1]['time'] == run_start